@@ -365,6 +365,19 @@ function saveOptimizerSettings(settings) {
   updateDataSheetHeaders();
 }
 
+/**
+ * Reads the objective name and parameter count with a single range read.
+ * Both cells sit in column B (OBJECTIVE_NAME_CELL above NUM_PARAMS_CELL), so
+ * one getValues() call replaces two round-trips to the Sheets service.
+ */
+function readSettingsHeader(sheet) {
+  const values = sheet.getRange(`${OBJECTIVE_NAME_CELL}:${NUM_PARAMS_CELL}`).getValues();
+  return {
+    objectiveName: values[0][0] || 'Objective',
+    numParams: parseInt(values[values.length - 1][0]) || 0
+  };
+}
+
 /**
  * Reads ONLY the parameter configuration and objective info from the sheet.
  */
@@ -372,8 +385,9 @@ function readOptimizerSettings() {
   const ss = SpreadsheetApp.getActiveSpreadsheet();
   const sheet = ss.getSheetByName(SETTINGS_SHEET_NAME);
   
-  const numParams = parseInt(sheet.getRange(NUM_PARAMS_CELL).getValue()) || 0;
-  const objectiveName = sheet.getRange(OBJECTIVE_NAME_CELL).getValue() || 'Objective';
+  const header = readSettingsHeader(sheet);
+  const numParams = header.numParams;
+  const objectiveName = header.objectiveName;
   
   const paramNames = [];
   const paramMins = [];
@@ -422,8 +436,9 @@ function updateDataSheetHeaders() {
 
   if (!dataSheet || !settingsSheet) return;
 
-  const numParams = parseInt(settingsSheet.getRange(NUM_PARAMS_CELL).getValue()) || 0;
-  const objectiveName = settingsSheet.getRange(OBJECTIVE_NAME_CELL).getValue() || 'Objective';
+  const header = readSettingsHeader(settingsSheet);
+  const numParams = header.numParams;
+  const objectiveName = header.objectiveName;
   const headers = ['Iteration'];
 
   if (numParams > 0) {
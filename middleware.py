@@ -17,12 +17,12 @@ def setup_request_logging(app):
         if hasattr(g, 'start_time'):
             elapsed = time.time() - g.start_time
             logger.info(
-                f"Request completed: "
-                f"method={request.method} "
-                f"path={request.path} "
-                f"status={response.status_code} "
-                f"duration={elapsed:.3f}s "
-                f"request_id={g.request_id}"
+                "Request completed: method=%s path=%s status=%d duration=%.3fs request_id=%s",
+                request.method,
+                request.path,
+                response.status_code,
+                elapsed,
+                g.request_id,
             )
         return response
     
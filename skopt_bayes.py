@@ -11,20 +11,46 @@ The main components are:
     `SkoptBayesianOptimizer`.
 -   `parse_training_data`: A utility function to convert the client's data format
     into numpy arrays suitable for `scikit-optimize`.
+-   `sample_initial_points`: Generates the first batch of points to evaluate
+    without constructing an optimizer.
 """
 
-from dataclasses import dataclass
-from typing import Dict, List, Any, Optional, Tuple
+from dataclasses import dataclass, field
+from typing import Dict, List, Any, Optional, Sequence, Tuple
+import math
+import os
+import warnings
 import numpy as np
 from skopt import Optimizer
-from skopt.space import Real
+from skopt.sampler import Sobol
+from skopt.space import Real, Space
+from skopt.utils import cook_estimator
+from sklearn.gaussian_process.kernels import Kernel, Sum, WhiteKernel
 
 from utils import setup_logging
 
 logger = setup_logging(__name__)
 
+# Worker count for the parallel L-BFGS acquisition restarts. This is a property
+# of the host rather than of a run, so it comes from the environment instead of
+# the (client-supplied) settings.
+ACQ_N_JOBS = int(os.environ.get('GSOPT_ACQ_N_JOBS', '1'))
 
-@dataclass
+# Upper limits for the acquisition effort a (client-supplied) settings payload
+# may request: candidates scored per ask, and L-BFGS restarts.
+MAX_N_POINTS = 10_000
+MAX_N_RESTARTS_OPTIMIZER = 20
+
+# skopt's Sobol generator only ships direction numbers for up to 40 dimensions.
+SOBOL_MAX_DIMS = 40
+
+
+def _clamp(value: int, low: int, high: int) -> int:
+    """Limits `value` to the inclusive range `[low, high]`."""
+    return max(low, min(value, high))
+
+
+@dataclass(frozen=True, slots=True)
 class OptimizerSettings:
     """Configuration settings for the optimizer."""
     base_estimator: str
@@ -32,11 +58,27 @@ class OptimizerSettings:
     acq_optimizer: str
     acq_func_kwargs: Dict[str, Any]
     num_params: int
-    param_names: List[str]
-    param_mins: List[float]
-    param_maxes: List[float]
+    param_names: Tuple[str, ...]
+    param_mins: Tuple[float, ...]
+    param_maxes: Tuple[float, ...]
     num_init_points: int
     batch_size: int
+    n_points: int
+    n_restarts_optimizer: int
+    # The parameter bounds as a `(num_params, 2)` array of `[min, max]` rows.
+    bounds: np.ndarray = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        # Coerce the JSON-decoded bounds (ints or numeric strings) to floats once,
+        # filling exact-size buffers rather than growing intermediate lists.
+        mins = np.fromiter(map(float, self.param_mins), dtype=np.float64, count=len(self.param_mins))
+        maxes = np.fromiter(map(float, self.param_maxes), dtype=np.float64, count=len(self.param_maxes))
+        self._validate_lengths()
+
+        # Frozen instances have to bypass their own __setattr__ for derived fields.
+        object.__setattr__(self, 'param_mins', tuple(mins.tolist()))
+        object.__setattr__(self, 'param_maxes', tuple(maxes.tolist()))
+        object.__setattr__(self, 'bounds', np.column_stack((mins, maxes)))
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'OptimizerSettings':
@@ -46,13 +88,46 @@ class OptimizerSettings:
             acq_optimizer=data.get('acq_optimizer', 'auto'),
             acq_func_kwargs=data.get('acq_func_kwargs', {}),
             num_params=data.get('num_params', 0),
-            param_names=data.get('param_names', []),
-            param_mins=data.get('param_mins', []),
-            param_maxes=data.get('param_maxes', []),
+            param_names=tuple(data.get('param_names', ())),
+            param_mins=tuple(data.get('param_mins', ())),
+            param_maxes=tuple(data.get('param_maxes', ())),
             num_init_points=data.get('num_init_points', 10),
-            batch_size=data.get('batch_size', 5)
+            batch_size=data.get('batch_size', 5),
+            n_points=_clamp(int(data.get('n_points', 1000)), 1, MAX_N_POINTS),
+            n_restarts_optimizer=_clamp(
+                int(data.get('n_restarts_optimizer', 5)), 1, MAX_N_RESTARTS_OPTIMIZER
+            )
         )
 
+    def _validate_lengths(self) -> None:
+        """Raises a `ValueError` unless names, mins and maxes line up one-to-one."""
+        lengths = {len(self.param_names), len(self.param_mins), len(self.param_maxes)}
+        if len(lengths) > 1:
+            raise ValueError(
+                "param_names, param_mins and param_maxes must have the same length "
+                f"(got {len(self.param_names)}, {len(self.param_mins)} and {len(self.param_maxes)})"
+            )
+
+    def validate_bounds(self) -> None:
+        """Raises a `ValueError` for mismatched parameter lists or any min not below its max."""
+        self._validate_lengths()
+        invalid = ~(self.bounds[:, 0] < self.bounds[:, 1])
+        if invalid.any():
+            names = [name for name, bad in zip(self.param_names, invalid) if bad]
+            raise ValueError(f"Parameter minimum must be less than maximum for: {', '.join(names)}")
+
+
+def _make_dimensions(
+    param_names: Sequence[str],
+    param_mins: Sequence[float],
+    param_maxes: Sequence[float]
+) -> List[Real]:
+    """Builds the `Real` search-space dimensions straight from the parallel lists."""
+    return [
+        Real(low=low, high=high, name=name)
+        for name, low, high in zip(param_names, param_mins, param_maxes, strict=True)
+    ]
+
 
 class SkoptBayesianOptimizer:
     """
@@ -70,7 +145,11 @@ class SkoptBayesianOptimizer:
         acquisition_function: str = 'EI',
         acq_optimizer: str = 'auto',
         acq_func_kwargs: Optional[Dict[str, Any]] = None,
-        n_initial_points: int = 5
+        n_initial_points: int = 5,
+        n_points: int = 1000,
+        n_restarts_optimizer: int = 5,
+        n_jobs: int = 1,
+        warm_start_kernel: Optional[Kernel] = None
     ):
         """
         Initializes the scikit-optimize Bayesian optimizer with a defined search space
@@ -86,44 +165,68 @@ class SkoptBayesianOptimizer:
             acq_func_kwargs: Additional arguments for the acquisition function.
             n_initial_points: The number of random points to sample before fitting
                               the surrogate model.
+            n_points: The number of random candidates the acquisition function is
+                      scored on in one vectorized pass (skopt's default is 10000).
+            n_restarts_optimizer: How many of the best candidates L-BFGS is
+                                  restarted from when `acq_optimizer` is 'lbfgs'.
+            n_jobs: How many of those L-BFGS restarts run in parallel (-1 for
+                    all cores).
+            warm_start_kernel: A kernel fitted on the same search space (see
+                               `fitted_kernel`). When given, a GP surrogate
+                               starts its hyperparameter search there with a
+                               single L-BFGS run instead of several restarts.
         """
         self.param_names = param_names
         self.param_mins = param_mins
         self.param_maxes = param_maxes
         
         # The search space is defined as a list of `Real` dimensions.
-        dimensions = [
-            Real(low=param_mins[i], high=param_maxes[i], name=name)
-            for i, name in enumerate(param_names)
-        ]
+        dimensions = _make_dimensions(param_names, param_mins, param_maxes)
         
-        logger.info(f"Created search space with {len(dimensions)} dimensions.")
-        logger.info(f"Parameters: {param_names}")
+        logger.info("Created search space with %d dimensions.", len(dimensions))
+        logger.info("Parameters: %s", param_names)
+        
+        estimator = base_estimator
+        if warm_start_kernel is not None and base_estimator == 'GP':
+            estimator = cook_estimator(
+                'GP', space=dimensions, kernel=warm_start_kernel, n_restarts_optimizer=0
+            )
         
         # The core `skopt.Optimizer` is instantiated here.
         self.optimizer = Optimizer(
             dimensions,
-            base_estimator=base_estimator,
+            base_estimator=estimator,
             acq_func=acquisition_function,
             acq_optimizer=acq_optimizer,
             acq_func_kwargs=acq_func_kwargs or {},
+            acq_optimizer_kwargs={
+                'n_points': n_points,
+                'n_restarts_optimizer': n_restarts_optimizer,
+                'n_jobs': n_jobs,
+            },
             n_initial_points=n_initial_points
         )
         
-        logger.info(f"Initialized scikit-optimize with: estimator={base_estimator}, acq_func={acquisition_function}, acq_optimizer={acq_optimizer}")
+        logger.info(
+            "Initialized scikit-optimize with: estimator=%s, acq_func=%s, acq_optimizer=%s",
+            base_estimator, acquisition_function, acq_optimizer
+        )
     
-    def ask(self, n_points: int = 1) -> List[List[float]]:
+    def ask(self, n_points: int = 1, strategy: str = 'cl_min') -> List[List[float]]:
         """
         Requests the next point(s) to evaluate from the optimizer.
         
         Args:
             n_points: The number of points to generate in a batch.
+            strategy: How a batch is filled. The constant-liar strategies
+                      ('cl_min', 'cl_mean', 'cl_max') fake the pending results
+                      and re-fit once per point, keeping the batch diverse.
             
         Returns:
             A list of points, where each point is a list of parameter values.
         """
-        points = self.optimizer.ask(n_points=n_points)
-        logger.info(f"Generated {len(points)} new points to evaluate.")
+        points = self.optimizer.ask(n_points=n_points, strategy=strategy)
+        logger.info("Generated %d new points to evaluate.", len(points))
         return points
     
     def tell(self, x_data: List[List[float]], y_data: List[float]) -> None:
@@ -139,15 +242,110 @@ class SkoptBayesianOptimizer:
             logger.warning("tell() was called with no data; no update will be performed.")
             return
         
-        logger.info(f"Training optimizer with {len(x_data)} new points.")
+        logger.info("Training optimizer with %d new points.", len(x_data))
         
         self.optimizer.tell(x_data, y_data)
     
+    def fitted_kernel(self) -> Optional[Kernel]:
+        """
+        Returns the GP kernel with the hyperparameters of the latest fit, or
+        None if no GP surrogate has been fitted yet.
+        """
+        models = self.optimizer.models
+        kernel = getattr(models[-1], 'kernel_', None) if models else None
+        
+        # skopt zeroes the fitted noise term after fitting; drop it so that the
+        # next fit adds (and estimates) a fresh one.
+        if isinstance(kernel, Sum) and isinstance(kernel.k2, WhiteKernel):
+            kernel = kernel.k1
+        return kernel
+    
     def get_name(self) -> str:
         """Returns the name of this optimizer backend."""
         return "scikit-optimize"
 
 
+def _has_objective(row: Dict[str, Any]) -> bool:
+    """Returns whether a row has been evaluated, i.e. carries an objective value."""
+    if not isinstance(row, dict):
+        return False
+    
+    objective = row.get('objective')
+    if isinstance(objective, str):
+        return objective.strip() != ''
+    if isinstance(objective, float):
+        # A NaN objective marks a missing value just like an empty cell.
+        return not math.isnan(objective)
+    return objective is not None
+
+
+def _parse_rows_bulk(
+    existing_data: List[Dict[str, Any]],
+    param_names: List[str]
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Converts all evaluated rows to float arrays in one vectorized pass.
+    
+    Raises `ValueError`, `TypeError` or `KeyError` on the first malformed value
+    so that the caller can fall back to validating row by row.
+    """
+    evaluated = [row for row in existing_data if _has_objective(row)]
+    n_rows, n_params = len(evaluated), len(param_names)
+    
+    # fromiter fills one preallocated buffer instead of building a list per row.
+    x_train = np.fromiter(
+        (row[name] for row in evaluated for name in param_names),
+        dtype=np.float64,
+        count=n_rows * n_params
+    ).reshape(n_rows, n_params)
+    y_train = np.fromiter((row['objective'] for row in evaluated), dtype=np.float64, count=n_rows)
+    
+    # numpy turns None into NaN where float() would raise, so treat any NaN
+    # parameter as malformed input and let the per-row path decide what to skip.
+    if np.isnan(x_train).any():
+        raise ValueError("Training data contains missing or NaN values.")
+    
+    # Non-finite objectives cannot be fitted by the surrogate; drop them with a
+    # single mask rather than re-validating every row.
+    finite = np.isfinite(y_train)
+    if not finite.all():
+        logger.warning("Skipping %d data points with non-finite objective values.", (~finite).sum())
+        x_train, y_train = x_train[finite], y_train[finite]
+    
+    return x_train, y_train
+
+
+def _parse_rows(
+    existing_data: List[Dict[str, Any]],
+    param_names: List[str]
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Converts rows one at a time, skipping (and reporting) any invalid point."""
+    n_rows = len(existing_data)
+    x_train = np.empty((n_rows, len(param_names)), dtype=np.float64)
+    y_train = np.empty(n_rows, dtype=np.float64)
+    valid = np.zeros(n_rows, dtype=bool)
+    
+    for i, row in enumerate(existing_data):
+        # Skip rows that haven't been evaluated yet.
+        if not _has_objective(row):
+            logger.debug("Skipping row %d because it has no objective value.", i)
+            continue
+        
+        try:
+            # Ensure all parameters are present and correctly typed.
+            y_value = float(row['objective'])
+            if not math.isfinite(y_value):
+                raise ValueError("objective is not finite")
+            x_train[i] = [float(row[name]) for name in param_names]
+            y_train[i] = y_value
+            valid[i] = True
+        except (ValueError, TypeError, KeyError) as e:
+            logger.warning("Skipping invalid data point at index %d: %s. Reason: %s", i, row, e)
+            continue
+    
+    return x_train[valid], y_train[valid]
+
+
 def parse_training_data(
     existing_data: List[Dict[str, Any]],
     param_names: List[str]
@@ -156,6 +354,9 @@ def parse_training_data(
     Parses and validates the client-provided data into a format suitable for
     the `tell` method of the optimizer.
     
+    Well-formed payloads are converted in a single vectorized pass; only when
+    that fails are the rows re-validated one by one to skip the bad points.
+    
     Args:
         existing_data: A list of dictionaries, where each dictionary represents
                        an evaluated point.
@@ -165,40 +366,60 @@ def parse_training_data(
         A tuple containing two lists: the parameter vectors (X_train) and the
         objective values (y_train).
     """
-    x_train: List[List[float]] = []
-    y_train: List[float] = []
-    
-    logger.info(f"Processing {len(existing_data)} existing data points for training.")
+    logger.info("Processing %d existing data points for training.", len(existing_data))
     
-    for i, row in enumerate(existing_data):
-        # Skip rows that haven't been evaluated yet.
-        if 'objective' not in row or row['objective'] is None or str(row['objective']).strip() == '':
-            logger.debug(f"Skipping row {i} because it has no objective value.")
-            continue
-        
-        try:
-            # Ensure all parameters are present and correctly typed.
-            x_point = [float(row[name]) for name in param_names]
-            y_value = float(row['objective'])
-            x_train.append(x_point)
-            y_train.append(y_value)
-        except (ValueError, TypeError, KeyError) as e:
-            logger.warning(f"Skipping invalid data point at index {i}: {row}. Reason: {e}")
-            continue
+    try:
+        x_array, y_array = _parse_rows_bulk(existing_data, param_names)
+    except (ValueError, TypeError, KeyError):
+        x_array, y_array = _parse_rows(existing_data, param_names)
+    x_train, y_train = x_array.tolist(), y_array.tolist()
     
     if not x_train:
         logger.warning("No valid, evaluated training points were found in the provided data.")
     else:
-        logger.info(f"Extracted {len(x_train)} valid training points.")
+        logger.info("Extracted %d valid training points.", len(x_train))
     
     return x_train, y_train
 
 
+def sample_initial_points(settings: OptimizerSettings) -> List[List[float]]:
+    """
+    Generates the initial points to evaluate from a scrambled Sobol sequence,
+    or uniformly at random when there are more parameters than Sobol supports.
+
+    No surrogate model is involved before any data exists, so this avoids
+    constructing an optimizer (and its estimator) just to draw samples.
+    """
+    settings.validate_bounds()
+    
+    dimensions = _make_dimensions(settings.param_names, settings.param_mins, settings.param_maxes)
+    
+    if len(dimensions) > SOBOL_MAX_DIMS:
+        points = Space(dimensions).rvs(n_samples=settings.num_init_points)
+        logger.info("Generated %d random initial points.", len(points))
+        return points
+    
+    with warnings.catch_warnings():
+        # Sobol balance is only exact for powers of two, but any sample count
+        # still gives a valid low-discrepancy design.
+        warnings.simplefilter("ignore", UserWarning)
+        points = Sobol().generate(dimensions, settings.num_init_points)
+    
+    logger.info("Generated %d initial points from a Sobol sequence.", len(points))
+    return points
+
+
 def build_optimizer(
     settings: OptimizerSettings,
-    existing_data: Optional[List[Dict[str, Any]]] = None
+    existing_data: Optional[List[Dict[str, Any]]] = None,
+    warm_start_kernel: Optional[Kernel] = None
 ) -> SkoptBayesianOptimizer:
-    """Constructs and trains the optimizer using settings object."""
+    """
+    Constructs and trains the optimizer using settings object, optionally
+    warm-starting the GP from a kernel fitted on the same search space.
+    """
+    settings.validate_bounds()
+    
     # Handle the 'SKOPT-' prefix logic internally
     algo = settings.base_estimator.split('-', 1)[1].upper() if '-' in settings.base_estimator else settings.base_estimator.upper()
     
@@ -210,7 +431,11 @@ def build_optimizer(
         acquisition_function=settings.acquisition_function,
         acq_optimizer=settings.acq_optimizer,
         acq_func_kwargs=settings.acq_func_kwargs,
-        n_initial_points=settings.num_init_points
+        n_initial_points=settings.num_init_points,
+        n_points=settings.n_points,
+        n_restarts_optimizer=settings.n_restarts_optimizer,
+        n_jobs=ACQ_N_JOBS,
+        warm_start_kernel=warm_start_kernel
     )
     
     if existing_data:
@@ -5,11 +5,12 @@ import io
 import base64
 import sys
 import os
+import subprocess
 from unittest.mock import MagicMock
 
-# -- MOCKING DEPENDENCIES BEFORE IMPORT --
-# We mock numpy and other heavy libs so tests run without them installed
-sys.modules['numpy'] = MagicMock()
+# -- DEPENDENCIES --
+# gsopt defers numpy, skopt and matplotlib to first use, so importing it needs no
+# mocks; the tests below patch the lazily bound names on gsopt._LAZY instead.
 # We assume flask is installed as it's the core framework, but if not, one would need to install it.
 # sys.modules['flask'] = ... (Cannot mock flask easily as we need the real test client)
 
@@ -17,11 +18,15 @@ sys.modules['numpy'] = MagicMock()
 sys.path.append(os.getcwd())
 
 import gsopt
+import skopt_bayes
 
 class TestGsOpt(unittest.TestCase):
     def setUp(self):
         self.app = gsopt.app.test_client()
         self.headers = {'X-User-Email': 'test@gmail.com'}
+        gsopt._optimizer_cache.clear()
+        gsopt._warm_start_kernels.clear()
+        gsopt._plot_figure_local.figure = None
         # valid settings payload
         self.settings_payload = {
             "base_estimator": "GP",
@@ -46,7 +51,7 @@ class TestGsOpt(unittest.TestCase):
         self.assertEqual(response.status_code, 403)
 
     def test_rate_limit(self):
-        gsopt._rate_limit_storage['rate_test@gmail.com'] = []
+        gsopt._rate_limit_storage.pop('rate_test@gmail.com', None)
         headers = {'X-User-Email': 'rate_test@gmail.com'}
         for _ in range(10):
             response = self.app.post('/ping', headers=headers)
@@ -54,6 +59,13 @@ class TestGsOpt(unittest.TestCase):
         response = self.app.post('/ping', headers=headers)
         self.assertEqual(response.status_code, 429)
 
+    def test_rate_limit_storage_is_bounded(self):
+        with patch.object(gsopt, '_RATE_LIMIT_MAX_USERS', 2):
+            for email in ('a@gmail.com', 'b@gmail.com', 'c@gmail.com'):
+                gsopt.check_rate_limit(email)
+            self.assertNotIn('a@gmail.com', gsopt._rate_limit_storage)
+            self.assertIn('c@gmail.com', gsopt._rate_limit_storage)
+
     def test_test_connection(self):
         response = self.app.post('/test-connection', headers=self.headers)
         self.assertEqual(response.status_code, 200)
@@ -64,10 +76,9 @@ class TestGsOpt(unittest.TestCase):
     def test_init_optimization(self):
         from unittest.mock import MagicMock
         gsopt._ensure_optimizer_builder = lambda: None
-        gsopt.OptimizerSettings = MagicMock()
-        gsopt.OptimizerSettings.from_dict.return_value = MagicMock(num_init_points=3, param_names=["x", "y"])
-        gsopt.build_skopt_optimizer = MagicMock()
-        gsopt.build_skopt_optimizer.return_value.ask.return_value = [[0.1, 0.2], [0.3, 0.4], [0.5, 0.6]]
+        gsopt._LAZY.OptimizerSettings = MagicMock()
+        gsopt._LAZY.OptimizerSettings.from_dict.return_value = MagicMock(num_init_points=3, param_names=["x", "y"])
+        gsopt._LAZY.sample_initial_points = MagicMock(return_value=[[0.1, 0.2], [0.3, 0.4], [0.5, 0.6]])
         payload = {"settings": self.settings_payload}
         response = self.app.post('/init-optimization', data=json.dumps(payload), content_type='application/json', headers=self.headers)
         self.assertEqual(response.status_code, 200)
@@ -80,10 +91,10 @@ class TestGsOpt(unittest.TestCase):
     def test_continue_optimization(self):
         from unittest.mock import MagicMock
         gsopt._ensure_optimizer_builder = lambda: None
-        gsopt.OptimizerSettings = MagicMock()
-        gsopt.OptimizerSettings.from_dict.return_value = MagicMock(batch_size=2, param_names=["x", "y"])
-        gsopt.build_skopt_optimizer = MagicMock()
-        gsopt.build_skopt_optimizer.return_value.ask.return_value = [[0.8, 0.9], [0.1, 0.0]]
+        gsopt._LAZY.OptimizerSettings = MagicMock()
+        gsopt._LAZY.OptimizerSettings.from_dict.return_value = MagicMock(batch_size=2, param_names=["x", "y"])
+        gsopt._LAZY.build_skopt_optimizer = MagicMock()
+        gsopt._LAZY.build_skopt_optimizer.return_value.ask.return_value = [[0.8, 0.9], [0.1, 0.0]]
         payload = {"settings": self.settings_payload, "existing_data": [{"x": 0.5, "y": 0.5, "objective": 0.1}]}
         response = self.app.post('/continue-optimization', data=json.dumps(payload), content_type='application/json', headers=self.headers)
         self.assertEqual(response.status_code, 200)
@@ -92,25 +103,184 @@ class TestGsOpt(unittest.TestCase):
 
     def test_plot(self):
         from unittest.mock import MagicMock
-        gsopt._ensure_matplotlib = lambda: None
-        gsopt._ensure_skopt_plots = lambda: None
+        gsopt._ensure_plot_libs = lambda: None
         gsopt._ensure_optimizer_builder = lambda: None
-        gsopt.plt = MagicMock()
-        gsopt.plot_convergence = MagicMock()
-        gsopt.OptimizerSettings = MagicMock()
-        gsopt.OptimizerSettings.from_dict.return_value = MagicMock(param_names=["x", "y"])
+        gsopt._LAZY.Figure = MagicMock()
+        gsopt._LAZY.FigureCanvasAgg = MagicMock()
+        gsopt._LAZY.plot_convergence = MagicMock()
+        gsopt._LAZY.OptimizerSettings = MagicMock()
+        gsopt._LAZY.OptimizerSettings.from_dict.return_value = MagicMock(param_names=["x", "y"])
         gsopt.build_optimizer = MagicMock()
         mock_opt = MagicMock()
         mock_opt.optimizer.get_result.return_value.x_iters = [[1, 2]]
         gsopt.build_optimizer.return_value = mock_opt
-        gsopt.plt.savefig.side_effect = lambda buf, **kwargs: buf.write(b'fake_png_data')
+        gsopt._LAZY.Figure.return_value.savefig.side_effect = lambda buf, **kwargs: buf.write(b'fake_png_data')
         payload = {"settings": self.settings_payload, "plot_type": "convergence", "existing_data": []}
         response = self.app.post('/plot', data=json.dumps(payload), content_type='application/json', headers=self.headers)
         self.assertEqual(response.status_code, 200)
         data = response.get_json()
         self.assertEqual(data['status'], 'success')
         self.assertTrue(len(data['plot_data']) > 0)
-        gsopt.plot_convergence.assert_called()
+        gsopt._LAZY.plot_convergence.assert_called()
+
+    def test_optimizer_cache_reuses_identical_payload(self):
+        existing_data = [{"x": 0.5, "y": 0.5, "objective": 0.1}]
+        with patch.object(gsopt, 'build_optimizer') as mock_build:
+            first = gsopt.get_or_build_optimizer(self.settings_payload, MagicMock(), existing_data)
+            second = gsopt.get_or_build_optimizer(dict(self.settings_payload), MagicMock(), list(existing_data))
+            self.assertIs(first, second)
+            self.assertEqual(mock_build.call_count, 1)
+            gsopt.get_or_build_optimizer(self.settings_payload, MagicMock(), existing_data + [{"x": 0.1, "y": 0.2, "objective": 0.3}])
+            self.assertEqual(mock_build.call_count, 2)
+            # The second fit is warm-started from the kernel of the first one
+            self.assertIs(mock_build.call_args[0][2], first.fitted_kernel.return_value)
+
+    def test_warm_start_only_when_data_extends_previous_fit(self):
+        def rows(points):
+            return [{"x": x, "y": y, "objective": (x - 0.3) ** 2 + (y - 0.7) ** 2} for x, y in points]
+
+        grid = [(i / 4, j / 4) for i in range(4) for j in range(4)]
+        first_data = rows(grid[:10])
+        settings = skopt_bayes.OptimizerSettings.from_dict(self.settings_payload)
+        with patch.object(gsopt, 'build_optimizer', side_effect=skopt_bayes.build_optimizer) as mock_build:
+            first = gsopt.get_or_build_optimizer(self.settings_payload, settings, first_data)
+            self.assertIsNone(mock_build.call_args[0][2])
+            self.assertIsNotNone(first.fitted_kernel())
+
+            # Appending new evaluations to the same run reuses the fitted kernel
+            gsopt.get_or_build_optimizer(self.settings_payload, settings, first_data + rows(grid[10:12]))
+            self.assertIs(mock_build.call_args[0][2], first.fitted_kernel())
+
+            # Unrelated data for the same settings (e.g. another sheet) fits cold
+            other_data = rows([(1 - x, y / 2) for x, y in grid[:12]])
+            gsopt.get_or_build_optimizer(self.settings_payload, settings, other_data)
+            self.assertIsNone(mock_build.call_args[0][2])
+            self.assertEqual(mock_build.call_count, 3)
+
+    def test_import_does_not_load_heavy_dependencies(self):
+        # Run in a fresh interpreter, as this process may already have them loaded
+        code = (
+            "import sys, gsopt; "
+            "print(','.join(m for m in ('numpy', 'skopt', 'matplotlib') if m in sys.modules))"
+        )
+        result = subprocess.run(
+            [sys.executable, '-c', code], cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True, text=True, check=True
+        )
+        self.assertEqual(result.stdout.strip(), '')
+
+
+class TestSkoptBayes(unittest.TestCase):
+    """Exercises the real scikit-optimize wrapper, without going through Flask."""
+
+    def make_settings(self, num_params, **overrides):
+        payload = {
+            "num_params": num_params,
+            "param_names": [f"p{i}" for i in range(num_params)],
+            "param_mins": [-1.0] * num_params,
+            "param_maxes": [2.0] * num_params,
+            "num_init_points": 6,
+        }
+        payload.update(overrides)
+        return skopt_bayes.OptimizerSettings.from_dict(payload)
+
+    def assert_points_in_bounds(self, points, settings):
+        self.assertEqual(len(points), settings.num_init_points)
+        for point in points:
+            self.assertEqual(len(point), settings.num_params)
+            for value, low, high in zip(point, settings.param_mins, settings.param_maxes):
+                self.assertTrue(low <= value <= high)
+
+    def test_acquisition_effort_is_clamped(self):
+        settings = self.make_settings(2, n_points=10**9, n_restarts_optimizer=0)
+        self.assertEqual(settings.n_points, skopt_bayes.MAX_N_POINTS)
+        self.assertEqual(settings.n_restarts_optimizer, 1)
+        settings = self.make_settings(2, n_points=-5, n_restarts_optimizer=10**6)
+        self.assertEqual(settings.n_points, 1)
+        self.assertEqual(settings.n_restarts_optimizer, skopt_bayes.MAX_N_RESTARTS_OPTIMIZER)
+
+    CLEAN_ROWS = [
+        {"p0": 0.1, "p1": "0.2", "objective": 1.5},
+        {"p0": 1, "p1": 2, "objective": "-3"},
+    ]
+    CLEAN_X = [[0.1, 0.2], [1.0, 2.0]]
+    CLEAN_Y = [1.5, -3.0]
+
+    def assert_parsed(self, rows, x_expected, y_expected):
+        x_train, y_train = skopt_bayes.parse_training_data(rows, ["p0", "p1"])
+        self.assertEqual(x_train, x_expected)
+        self.assertEqual(y_train, y_expected)
+
+    def test_parse_training_data_clean_payload(self):
+        self.assert_parsed(self.CLEAN_ROWS, self.CLEAN_X, self.CLEAN_Y)
+
+    def test_parse_training_data_skips_unevaluated_and_non_finite(self):
+        # All of these are handled by the vectorized path without falling back
+        rows = self.CLEAN_ROWS + [
+            {"p0": 0.5, "p1": 0.5, "objective": ""},
+            {"p0": 0.5, "p1": 0.5, "objective": "  "},
+            {"p0": 0.5, "p1": 0.5, "objective": None},
+            {"p0": 0.5, "p1": 0.5},
+            {"p0": 0.5, "p1": 0.5, "objective": float("nan")},
+            {"p0": 0.5, "p1": 0.5, "objective": "nan"},
+            {"p0": 0.5, "p1": 0.5, "objective": float("inf")},
+            ["not", "a", "row"],
+        ]
+        x_bulk, y_bulk = skopt_bayes._parse_rows_bulk(rows, ["p0", "p1"])
+        x_rows, y_rows = skopt_bayes._parse_rows(rows, ["p0", "p1"])
+        self.assertEqual(x_bulk.tolist(), x_rows.tolist())
+        self.assertEqual(y_bulk.tolist(), y_rows.tolist())
+        self.assert_parsed(rows, self.CLEAN_X, self.CLEAN_Y)
+
+    def test_parse_training_data_falls_back_on_malformed_rows(self):
+        bad_rows = [
+            {"p0": None, "p1": 0.5, "objective": 1.0},
+            {"p0": "abc", "p1": 0.5, "objective": 1.0},
+            {"p0": [1, 2], "p1": 0.5, "objective": 1.0},
+            {"p0": {"v": 1}, "p1": 0.5, "objective": 1.0},
+            {"p0": 0.5, "objective": 1.0},
+            {"p0": 0.5, "p1": 0.5, "objective": [1.0]},
+        ]
+        for bad_row in bad_rows:
+            with self.subTest(row=bad_row):
+                rows = [self.CLEAN_ROWS[0], bad_row, self.CLEAN_ROWS[1]]
+                with self.assertRaises((ValueError, TypeError, KeyError)):
+                    skopt_bayes._parse_rows_bulk(rows, ["p0", "p1"])
+                x_rows, y_rows = skopt_bayes._parse_rows(rows, ["p0", "p1"])
+                self.assertEqual((x_rows.tolist(), y_rows.tolist()), (self.CLEAN_X, self.CLEAN_Y))
+                self.assert_parsed(rows, self.CLEAN_X, self.CLEAN_Y)
+
+    def test_validate_bounds_rejects_inverted_bounds(self):
+        settings = self.make_settings(3, param_mins=[0.0, 1.0, 2.0], param_maxes=[1.0, 1.0, 1.0])
+        with self.assertRaisesRegex(ValueError, "p1, p2"):
+            settings.validate_bounds()
+        self.make_settings(3).validate_bounds()
+
+    def test_validate_bounds_rejects_mismatched_lengths(self):
+        with self.assertRaisesRegex(ValueError, "same length"):
+            self.make_settings(2, param_names=["p0", "p1", "p2"])
+        with self.assertRaisesRegex(ValueError, "same length"):
+            self.make_settings(2, param_maxes=[2.0])
+
+        # Settings are frozen, so force the mismatch past construction
+        settings = self.make_settings(2)
+        object.__setattr__(settings, "param_names", ("p0", "p1", "p2"))
+        with self.assertRaisesRegex(ValueError, "same length"):
+            settings.validate_bounds()
+        with self.assertRaisesRegex(ValueError, "same length"):
+            skopt_bayes.sample_initial_points(settings)
+
+    def test_sample_initial_points_uses_sobol(self):
+        settings = self.make_settings(3)
+        with patch.object(skopt_bayes.Space, 'rvs') as mock_rvs:
+            points = skopt_bayes.sample_initial_points(settings)
+        mock_rvs.assert_not_called()
+        self.assert_points_in_bounds(points, settings)
+
+    def test_sample_initial_points_beyond_sobol_dimensions(self):
+        settings = self.make_settings(skopt_bayes.SOBOL_MAX_DIMS + 5)
+        points = skopt_bayes.sample_initial_points(settings)
+        self.assert_points_in_bounds(points, settings)
 
 if __name__ == '__main__':
     unittest.main()